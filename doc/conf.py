@@ -7,8 +7,14 @@ authors = u'Panel contributors'
 copyright = u'2019 ' + authors
 description = 'High-level dashboarding for python visualization libraries'
 
-import panel
-version = release = str(panel.__version__)
+import os
+import param
+
+# Resolve the version the same way panel/__init__.py does, without
+# importing panel and all of its dependencies
+version = release = str(param.version.Version(
+    fpath=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'panel', '__init__.py'),
+    archive_commit="$Format:%h$", reponame="panel"))
 
 html_static_path += ['_static']
 html_theme = 'sphinx_ioam_theme'
@@ -278,9 +278,10 @@ def _cleanup_panel(msg_id):
     """
     A cleanup action which is called when a plot is deleted in the notebook
     """
-    if msg_id not in state._views:
+    view = state._views.pop(msg_id, None)
+    if view is None:
         return
-    viewable, model, _, _ = state._views.pop(msg_id)
+    viewable, model, _, _ = view
     viewable._cleanup(model)
 
 
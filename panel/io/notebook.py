@@ -4,8 +4,10 @@ inside the Jupyter notebook.
 """
 from __future__ import absolute_import, division, unicode_literals
 
+import hashlib
 import json
 import os
+import struct
 import uuid
 
 from contextlib import contextmanager
@@ -25,19 +27,35 @@ from bokeh.embed.util import standalone_docs_json_and_render_items
 from bokeh.embed.wrappers import wrap_in_script_tag
 from bokeh.models import CustomJS, LayoutDOM, Model
 from bokeh.resources import CDN, INLINE
-from bokeh.util.string import encode_utf8, escape
+from bokeh.util.string import encode_utf8
 from bokeh.util.serialization import make_id
-from jinja2 import Environment, Markup, FileSystemLoader
+from jinja2 import (
+    ChoiceLoader, Environment, FileSystemLoader, Markup, ModuleLoader,
+    __version__ as jinja_version)
 from pyviz_comms import (
     JS_CALLBACK, PYVIZ_PROXY, Comm, JupyterCommManager as _JupyterCommManager,
     nb_mime_js)
 
 from ..compiler import require_components
+from ..util import memoize
 from .embed import embed_state
 from .model import add_to_doc, diff
 from .server import _server_url, _origin_url, get_server
 from .state import state
 
+try:
+    import orjson
+    def _dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    try:
+        import ujson
+        def _dumps(obj):
+            return ujson.dumps(obj, ensure_ascii=False)
+    except ImportError:
+        def _dumps(obj):
+            return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
 
 #---------------------------------------------------------------------
 # Private API
@@ -47,6 +65,14 @@ LOAD_MIME = 'application/vnd.holoviews_load.v0+json'
 EXEC_MIME = 'application/vnd.holoviews_exec.v0+json'
 HTML_MIME = 'text/html'
 
+# Escapes the characters which may not appear in an inline JSON script
+# tag using JSON unicode escapes, which are decoded by JSON.parse
+_JSON_HTML_ESCAPES = {
+    ord('<'): '\\u003c',
+    ord('>'): '\\u003e',
+    ord('&'): '\\u0026'
+}
+
 ABORT_JS = """
 if (!window.PyViz) {{
   return;
@@ -91,7 +117,31 @@ if (plot_id in window.PyViz.receivers) {{
   window.PyViz.receivers[plot_id] = receiver;
 }}
 
-if ((buffers != undefined) && (buffers.length > 0)) {{
+if ((msg != null) && msg.framed) {{
+  var frame = buffers[0];
+  var view = new DataView(frame.buffer, frame.byteOffset, frame.byteLength);
+  var decoder = new TextDecoder('utf-8');
+  var offset = 16;
+  var read = function(length) {{
+    var bytes = new Uint8Array(frame.buffer, frame.byteOffset+offset, length);
+    offset += length;
+    return decoder.decode(bytes);
+  }}
+  var nheader = view.getUint32(0, true);
+  var nmetadata = view.getUint32(4, true);
+  var ncontent = view.getUint32(8, true);
+  var nbuffers = view.getUint32(12, true);
+  receiver.consume(read(nheader))
+  receiver.consume(read(nmetadata))
+  receiver.consume(read(ncontent))
+  for (var i = 0; i < nbuffers; i++) {{
+    var nbuffer_header = view.getUint32(offset, true);
+    offset += 4;
+    receiver.consume(read(nbuffer_header))
+    var payload = buffers[i+1];
+    receiver.consume(payload.buffer.slice(payload.byteOffset, payload.byteOffset+payload.byteLength))
+  }}
+}} else if ((buffers != undefined) && (buffers.length > 0)) {{
   receiver.consume(buffers[0].buffer)
 }} else {{
   receiver.consume(msg)
@@ -103,51 +153,160 @@ if ((comm_msg != null) && (Object.keys(comm_msg.content).length > 0)) {{
 }}
 """
 
+DATA_JS = """\
+data = {{{change}: cb_obj['{change}'], 'id': cb_obj.id}};
+cb_obj.event_name = '{change}';"""
+
+MODEL_HTML = """\
+<div id='{id}'>{div}</div>
+<script type="application/javascript">{comm_js}{js}</script>"""
+
+@memoize(4096)
+def _comm_change_js(plot_id, change):
+    # Abort callback if value matches last received event
+    abort = ABORT_JS.format(plot_id=plot_id, change=change)
+    fetch_data = DATA_JS.format(change=change)
+    return '\n'.join([abort, fetch_data])
+
+
+@memoize(1024)
+def _bokeh_msg_handler(plot_id):
+    return bokeh_msg_handler.format(plot_id=plot_id)
+
+
 def get_comm_customjs(change, client_comm, plot_id, timeout=5000, debounce=50):
     """
     Returns a CustomJS callback that can be attached to send the
     model state across the notebook comms.
     """
-    # Abort callback if value matches last received event
-    abort = ABORT_JS.format(plot_id=plot_id, change=change)
-    data_template = """\
-data = {{{change}: cb_obj['{change}'], 'id': cb_obj.id}};
-cb_obj.event_name = '{change}';"""
-
-    fetch_data = data_template.format(change=change)
     self_callback = JS_CALLBACK.format(
         comm_id=client_comm.id, timeout=timeout, debounce=debounce,
         plot_id=plot_id)
-    return CustomJS(code='\n'.join([abort, fetch_data, self_callback]))
+    return CustomJS(code='\n'.join([_comm_change_js(plot_id, change), self_callback]))
 
 
+def _frame_message(msg):
+    """
+    Packs the header, metadata, content and buffer headers of a bokeh
+    protocol message into a single length-prefixed binary frame. The
+    frame starts with four little-endian uint32 values giving the
+    lengths of the header, metadata and content and the number of
+    buffers, followed by the UTF-8 encoded parts and each buffer
+    header prefixed by its own length.
+    """
+    header = msg.header_json.encode('utf-8')
+    metadata = msg.metadata_json.encode('utf-8')
+    content = msg.content_json.encode('utf-8')
+    parts = [struct.pack('<IIII', len(header), len(metadata), len(content),
+                         len(msg.buffers)), header, metadata, content]
+    for buffer_header, _ in msg.buffers:
+        buffer_header = _dumps(buffer_header).encode('utf-8')
+        parts.append(struct.pack('<I', len(buffer_header)))
+        parts.append(buffer_header)
+    return b''.join(parts)
+
 
 def push(doc, comm, binary=True):
     """
     Pushes events stored on the document across the provided comm.
+
+    In binary mode the message is sent as a single comm message with
+    the framed message parts in the first buffer followed by the raw
+    buffer payloads, otherwise each part is sent as a separate text
+    message.
     """
     msg = diff(doc, binary=binary)
     if msg is None:
         return
+    if binary:
+        buffers = [_frame_message(msg)] + [payload for _, payload in msg.buffers]
+        comm.send({'framed': True}, buffers=buffers)
+        return
     comm.send(msg.header_json)
     comm.send(msg.metadata_json)
     comm.send(msg.content_json)
     for header, payload in msg.buffers:
-        comm.send(json.dumps(header))
+        comm.send(_dumps(header))
         comm.send(buffers=[payload])
 
 
+def _compiled_templates(local_path):
+    ''' Returns the path to the precompiled templates if they were
+    compiled with the installed Jinja version and are not older than
+    any of the template sources.
+    '''
+    compiled_path = os.path.join(local_path, 'compiled')
+    version_path = os.path.join(compiled_path, 'jinja_version')
+    try:
+        with open(version_path) as f:
+            version = f.read().strip()
+        compiled_mtime = os.path.getmtime(version_path)
+        sources = [os.path.join(local_path, f) for f in os.listdir(local_path)]
+        source_mtime = max(os.path.getmtime(f) for f in sources if os.path.isfile(f))
+    except (IOError, OSError, ValueError):
+        return None
+    if version != jinja_version or source_mtime > compiled_mtime:
+        return None
+    return compiled_path
+
+
 def get_env():
     ''' Get the correct Jinja2 Environment, also for frozen scripts.
+
+    If the templates were precompiled at build time the compiled
+    modules are loaded in preference to parsing the template sources.
     '''
     local_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '_templates'))
-    return Environment(loader=FileSystemLoader(local_path))
+    compiled_path = _compiled_templates(local_path)
+    loader = FileSystemLoader(local_path)
+    if compiled_path is not None:
+        loader = ChoiceLoader([ModuleLoader(compiled_path), loader])
+    return Environment(loader=loader, auto_reload=False, cache_size=400)
 
 _env = get_env()
-_env.filters['json'] = lambda obj: Markup(json.dumps(obj))
+_env.filters['json'] = lambda obj: Markup(_dumps(obj))
 AUTOLOAD_NB_JS = _env.get_template("autoload_panel_js.js")
 NB_TEMPLATE_BASE = _env.get_template('nb_template.html')
 
+@memoize(256)
+def _template_from_string(template):
+    """
+    Compiles a template string extending the notebook base template,
+    reusing a previously compiled template if one is available.
+    """
+    return _env.from_string("{% extends base %}\n" + template)
+
+# Caches of the resource bundles and rendered autoload JS
+_BUNDLES = {}
+_AUTOLOAD_CACHE = {}
+
+def _resources_key():
+    """
+    Returns a key identifying the configured external resources which
+    are patched into the bokeh resources, including the modification
+    time of local CSS files since their contents are inlined.
+    """
+    from ..config import config
+    css_files = tuple(
+        (cssf, os.path.getmtime(cssf) if os.path.isfile(cssf) else None)
+        for cssf in config.css_files)
+    return (tuple(config.raw_css), css_files,
+            tuple(sorted(config.js_files.items())))
+
+def _resource_bundle(inline, resources_key=None):
+    """
+    Returns the bokeh resource bundle, which is only regenerated when
+    new bokeh models have been registered or the configured external
+    resources changed since it was last built.
+    """
+    if resources_key is None:
+        resources_key = _resources_key()
+    key = (inline, len(Model.model_class_reverse_map), resources_key)
+    if key not in _BUNDLES:
+        resources = INLINE if inline else CDN
+        _BUNDLES[key] = bundle_for_objs_and_resources(None, resources)
+    return _BUNDLES[key]
+
 def _autoload_js(bundle, configs, requirements, exports, load_timeout=5000):
     return AUTOLOAD_NB_JS.render(
         bundle    = bundle,
@@ -163,17 +322,22 @@ def html_for_render_items(comm_js, docs_json, render_items, template=None, templ
     comm_js = wrap_in_script_tag(comm_js)
 
     json_id = make_id()
-    json = escape(serialize_json(docs_json), quote=False)
-    json = wrap_in_script_tag(json, "application/json", json_id)
-
+    json = serialize_json(docs_json).translate(_JSON_HTML_ESCAPES)
     script = wrap_in_script_tag(script_for_render_items(json_id, render_items))
 
+    # Whitespace inside the JSON payload is insignificant, so it can be
+    # wrapped directly instead of being indented by wrap_in_script_tag
+    plot_script = ''.join([
+        '\n<script type="application/json" id="', json_id, '">\n  ',
+        json, '\n</script>', script
+    ])
+
     context = template_variables.copy()
 
     context.update(dict(
         title = '',
         bokeh_js = comm_js,
-        plot_script = json + script,
+        plot_script = plot_script,
         docs = render_items,
         base = NB_TEMPLATE_BASE,
         macros = MACROS,
@@ -186,18 +350,18 @@ def html_for_render_items(comm_js, docs_json, render_items, template=None, templ
     if template is None:
         template = NB_TEMPLATE_BASE
     elif isinstance(template, string_types):
-        template = _env.from_string("{% extends base %}\n" + template)
+        template = _template_from_string(template)
 
     html = template.render(context)
     return encode_utf8(html)
 
 
 def render_template(document, comm=None):
-    plot_id = document.roots[0].ref['id']
+    plot_id = document.roots[0].id
     (docs_json, render_items) = standalone_docs_json_and_render_items(document)
 
     if comm:
-        msg_handler = bokeh_msg_handler.format(plot_id=plot_id)
+        msg_handler = _bokeh_msg_handler(plot_id)
         comm_js = comm.js_template.format(plot_id=plot_id, comm_id=comm.id, msg_handler=msg_handler)
     else:
         comm_js = ''
@@ -214,7 +378,7 @@ def render_model(model, comm=None):
     if not isinstance(model, Model):
         raise ValueError("notebook_content expects a single Model instance")
 
-    target = model.ref['id']
+    target = model.id
 
     (docs_json, [render_item]) = standalone_docs_json_and_render_items([model])
     div = div_for_render_item(render_item)
@@ -224,19 +388,17 @@ def render_model(model, comm=None):
         render_items=serialize_json([render_item]),
     )
     bokeh_script, bokeh_div = encode_utf8(script), encode_utf8(div)
-    html = "<div id='{id}'>{html}</div>".format(id=target, html=bokeh_div)
 
     # Publish bokeh plot JS
-    msg_handler = bokeh_msg_handler.format(plot_id=target)
-
     if comm:
+        msg_handler = _bokeh_msg_handler(target)
         comm_js = comm.js_template.format(plot_id=target, comm_id=comm.id, msg_handler=msg_handler)
-        bokeh_js = '\n'.join([comm_js, bokeh_script])
+        comm_js += '\n'
     else:
-        bokeh_js = bokeh_script
+        comm_js = ''
 
-    data = {'text/html': html, 'application/javascript': bokeh_js}
-    return ({'text/html': mimebundle_to_html(data), EXEC_MIME: ''},
+    html = MODEL_HTML.format(id=target, div=bokeh_div, comm_js=comm_js, js=bokeh_script)
+    return ({'text/html': html, EXEC_MIME: ''},
             {EXEC_MIME: {'id': target}})
 
 
@@ -283,11 +445,16 @@ def block_comm():
 def load_notebook(inline=True, load_timeout=5000):
     from IPython.display import publish_display_data
 
-    resources = INLINE if inline else CDN
-    bundle = bundle_for_objs_and_resources(None, resources)
     configs, requirements, exports = require_components()
-
-    bokeh_js = _autoload_js(bundle, configs, requirements, exports, load_timeout)
+    components = _dumps([configs, requirements, exports]).encode('utf-8')
+    resources_key = _resources_key()
+    key = (inline, load_timeout, len(Model.model_class_reverse_map),
+           resources_key, hashlib.sha1(components).hexdigest())
+    bokeh_js = _AUTOLOAD_CACHE.get(key)
+    if bokeh_js is None:
+        bundle = _resource_bundle(inline, resources_key)
+        bokeh_js = _autoload_js(bundle, configs, requirements, exports, load_timeout)
+        _AUTOLOAD_CACHE[key] = bokeh_js
     publish_display_data({
         'application/javascript': bokeh_js,
         LOAD_MIME: bokeh_js,
@@ -11,7 +11,7 @@ from functools import partial
 
 from bokeh.server.server import Server
 
-from .state import state
+from .state import ServerEntry, state
 
 
 #---------------------------------------------------------------------
@@ -80,7 +80,7 @@ def get_server(panel, port=0, websocket_origin=None, loop=None,
 
     server_id = kwargs.pop('server_id', uuid.uuid4().hex)
     server = Server({'/': partial(panel._modify_doc, server_id)}, port=port, **opts)
-    state._servers[server_id] = (server, panel, [])
+    state._servers[server_id] = ServerEntry(server, panel, [])
 
     if show:
         def show_callback():
@@ -5,31 +5,36 @@ from __future__ import absolute_import, division, unicode_literals
 
 import threading
 
+from collections import namedtuple
+
 import param
 
-from bokeh.document import Document
 from bokeh.io import curdoc as _curdoc
 from pyviz_comms import CommManager as _CommManager
 
 
+# Entry in the index of active views
+ViewEntry = namedtuple('ViewEntry', ['viewable', 'root', 'doc', 'comm'])
+
+# Entry in the index of active servers
+ServerEntry = namedtuple('ServerEntry', ['server', 'panel', 'docs'])
+
+
 class _state(param.Parameterized):
     """
     Holds global state associated with running apps, allowing running
     apps to indicate their state to a user.
     """
 
-    _curdoc = param.ClassSelector(class_=Document, doc="""
-        The bokeh Document for which a server event is currently being
-        processed.""")
-
     webdriver = param.Parameter(default=None, doc="""
         Selenium webdriver used to export bokeh models to pngs.""")
 
     # Whether to hold comm events
     _hold = False
 
-    # Used to ensure that events are not scheduled from the wrong thread
-    _thread_id = None
+    # Thread-local storage for the Document currently being processed,
+    # used to ensure that events are not scheduled from the wrong thread
+    _tls = threading.local()
 
     _comm_manager = _CommManager
 
@@ -41,40 +46,42 @@ class _state(param.Parameterized):
 
     def __repr__(self):
         server_info = []
-        for server, panel, docs in self._servers.values():
+        for entry in self._servers.values():
+            server = entry.server
             server_info.append("{}:{:d} - {!r}".format(
-                server.address or "localhost", server.port, panel)
+                server.address or "localhost", server.port, entry.panel)
             )
         return "state(servers=\n  {}\n)".format(",\n  ".join(server_info))
 
     def kill_all_servers(self):
         """Stop all servers and clear them from the current state."""
-        for server_id in self._servers:
+        for entry in self._servers.values():
             try:
-                self._servers[server_id][0].stop()
+                entry.server.stop()
             except AssertionError:  # can't stop a server twice
                 pass
         self._servers = {}
 
     def _unblocked(self, doc):
-        thread = threading.current_thread()
-        thread_id = thread.ident if thread else None
-        return (doc is self.curdoc and self._thread_id == thread_id)
+        return doc is not None and getattr(self._tls, 'doc', None) is doc
 
     @property
     def curdoc(self):
-        if self._curdoc:
-            return self._curdoc
-        elif _curdoc().session_context:
-            return _curdoc()
+        doc = getattr(self._tls, 'doc', None)
+        if doc is not None:
+            return doc
+        doc = _curdoc()
+        if doc.session_context:
+            return doc
 
     @curdoc.setter
     def curdoc(self, doc):
-        self._curdoc = doc
+        self._tls.doc = doc
 
     @property
     def session_args(self):
-        return self.curdoc.session_context.request.arguments if self.curdoc else {}
+        doc = self.curdoc
+        return doc.session_context.request.arguments if doc else {}
 
 
 state = _state()
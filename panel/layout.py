@@ -70,8 +70,9 @@ class Panel(Reactive):
 
         from .io import state
         ref = root.ref['id']
-        if ref in state._views:
-            state._views[ref][0]._preprocess(root)
+        view = state._views.get(ref)
+        if view is not None:
+            view.viewable._preprocess(root)
 
         if comm is None and not held:
             doc.unhold()
@@ -403,8 +404,9 @@ class GridBox(ListPanel):
 
         from .io import state
         ref = root.ref['id']
-        if ref in state._views:
-            state._views[ref][0]._preprocess(root)
+        view = state._views.get(ref)
+        if view is not None:
+            view.viewable._preprocess(root)
 
         if comm is None and not held:
             doc.unhold()
@@ -7,13 +7,110 @@ import param
 import weakref
 import sys
 
+from operator import attrgetter
+
 from .viewable import Viewable, Reactive
 from .pane.holoviews import HoloViews, generate_panel_bokeh_map, is_bokeh_element_plot
-from .util import unicode_repr
+from .util import memoize, unicode_repr
 
 from bokeh.models import (CustomJS, Model as BkModel)
 
 
+_missing = object()
+
+
+@memoize(1024)
+def _spec_getter(model_spec):
+    """
+    Returns a getter resolving a period separated attribute path.
+    """
+    return attrgetter(model_spec)
+
+
+@memoize(1024)
+def _link_code(src_spec, tgt_spec):
+    """
+    Returns the JS code setting the target property to the value of
+    the source property.
+    """
+    return ("value = source[{src_repr}];"
+            "try {{ property = target.properties[{tgt_repr}];"
+            "if (property !== undefined) {{ property.validate(value); }} }}"
+            "catch(err) {{ console.log('WARNING: Could not set {tgt} on target, raised error: ' + err); return; }}"
+            "target[{tgt_repr}] = value".format(
+                tgt=tgt_spec, tgt_repr=unicode_repr(tgt_spec),
+                src_repr=unicode_repr(src_spec)))
+
+
+@memoize(256)
+def _watched_params(cls):
+    """
+    Returns the names of the parameters of a Callback class which
+    invalidate the cached parameter values.
+    """
+    return [p for p in cls.param if p != 'name']
+
+
+class _LinkIndex(object):
+    """
+    Holds the links registered on a particular source, indexed by the
+    type and target of each link so that equivalent links can be
+    looked up without scanning all links registered on the source.
+    Iterating over the index yields the links in registration order.
+    """
+
+    def __init__(self):
+        self._links = []
+        self._index = {}
+        # Keys of the registered links, computed when a link is added
+        # since the target of a link may since have been collected
+        self._keys = {}
+
+    @staticmethod
+    def _key(link):
+        return (type(link), id(getattr(link, 'target', None)))
+
+    def __iter__(self):
+        return iter(self._links)
+
+    def __len__(self):
+        return len(self._links)
+
+    def __contains__(self, link):
+        return id(link) in self._keys
+
+    def add(self, link):
+        key = self._key(link)
+        self._keys[id(link)] = key
+        self._links.append(link)
+        self._index.setdefault(key, []).append(link)
+
+    def remove(self, link):
+        key = self._keys.pop(id(link), None)
+        if key is None:
+            return
+        bucket = [l for l in self._index.get(key, []) if l is not link]
+        if bucket:
+            self._index[key] = bucket
+        else:
+            self._index.pop(key, None)
+        self._links = [l for l in self._links if l is not link]
+
+    def find(self, link):
+        """
+        Returns a registered link equivalent to the supplied link,
+        i.e. one of the same type with the same source, target and
+        parameter values, or None if there is no such link.
+        """
+        target = getattr(link, 'target', None)
+        params = link._link_params()
+        for other in self._index.get(self._key(link), []):
+            if (other.source is link.source and
+                getattr(other, 'target', None) is target and
+                other._link_params() == params):
+                return other
+
+
 class Callback(param.Parameterized):
     """
     A Callback defines some callback to be triggered when a property
@@ -31,7 +128,7 @@ class Callback(param.Parameterized):
         A dictionary mapping from a source specication to a JS code
         snippet to be executed if the source property changes.""")
 
-    # Mapping from a source id to a Link instance
+    # Mapping from a source to an index of the Links registered on it
     registry = weakref.WeakKeyDictionary()
 
     # Mapping to define callbacks by backend and Link type.
@@ -44,28 +141,39 @@ class Callback(param.Parameterized):
     def __init__(self, source, target=None, **params):
         if source is None:
             raise ValueError('%s must define a source' % type(self).__name__)
-        # Source is stored as a weakref to allow it to be garbage collected
+        # Source is stored as a weakref to allow it to be garbage
+        # collected, weakrefs without a callback are shared between
+        # all links on the same source
         self._source = None if source is None else weakref.ref(source)
+        self._param_cache = None
         super(Callback, self).__init__(**params)
+        self.param.watch(self._clear_param_cache, _watched_params(type(self)))
         self.init()
 
+    def _clear_param_cache(self, *events):
+        self._param_cache = None
+
+    def _link_params(self):
+        """
+        Returns the parameter values (excluding the name) used to
+        determine whether two links are equivalent, caching them until
+        one of the parameters changes.
+        """
+        if self._param_cache is None:
+            self._param_cache = {
+                k: v for k, v in self.get_param_values() if k != 'name'}
+        return self._param_cache
+
     def init(self):
         """
         Registers the Callback
         """
-        if self.source in self.registry:
-            links = self.registry[self.source]
-            params = {
-                k: v for k, v in self.get_param_values() if k != 'name'}
-            for link in links:
-                link_params = {
-                    k: v for k, v in link.get_param_values() if k != 'name'}
-                if (type(link) is type(self) and link.source is self.source
-                    and link.target is self.target and params == link_params):
-                    return
-            self.registry[self.source].append(self)
-        else:
-            self.registry[self.source] = [self]
+        links = self.registry.get(self.source)
+        if links is None:
+            links = self.registry[self.source] = _LinkIndex()
+        elif links.find(self) is not None:
+            return
+        links.add(self)
 
     @classmethod
     def register_callback(cls, callback):
@@ -81,7 +189,8 @@ class Callback(param.Parameterized):
 
     @classmethod
     def _process_callbacks(cls, root_view, root_model):
-        if not root_model:
+        if not root_model or not any(cls.registry.values()):
+            # Avoid traversing the root if no links were registered
             return
 
         linkable = root_view.select(Viewable)
@@ -90,35 +199,61 @@ class Callback(param.Parameterized):
         if not linkable:
             return
 
-        found = [(link, src, getattr(link, 'target', None)) for src in linkable
-                 for link in cls.registry.get(src, [])
-                 if not link._requires_target or link.target in linkable]
-
-        arg_overrides = {}
-        if 'holoviews' in sys.modules:
-            hv_views = root_view.select(HoloViews)
-            map_hve_bk = generate_panel_bokeh_map(root_model, hv_views)
-            for src in linkable:
-                for link in cls.registry.get(src, []):
-                    if hasattr(link, 'target'):
-                        for tgt in map_hve_bk.get(link.target, []):
-                            found.append((link, src, tgt))
-                    arg_overrides[id(link)] = {}
-                    for k, v in link.args.items():
-                        for tgt in map_hve_bk.get(v, []):
-                            arg_overrides[id(link)][k] = tgt
+        # Index linkable objects by id for constant time membership tests
+        linkable_ids = set(id(obj) for obj in linkable)
+
+        # Visit either the registered sources or the linkable objects,
+        # whichever is smaller
+        if len(cls.registry) < len(linkable):
+            linked = [(src, links) for src, links in list(cls.registry.items())
+                      if links and id(src) in linkable_ids]
+        else:
+            linked = [(src, cls.registry.get(src)) for src in linkable]
+            linked = [(src, links) for src, links in linked if links]
+        found = [(link, src, getattr(link, 'target', None)) for src, links in linked
+                 for link in links
+                 if not link._requires_target or id(link.target) in linkable_ids]
+
+        hv_loaded = 'holoviews' in sys.modules
+        if hv_loaded:
+            hv_found, arg_overrides = cls._process_hv_links(root_view, root_model, linked)
+            found.extend(hv_found)
+        else:
+            arg_overrides = {}
 
         callbacks = []
+        handles_cache = {}
         for link, src, tgt in found:
-            cb = cls._callbacks[type(link)]
-            if src is None or (getattr(link, '_requires_target', False)
-                               and tgt is None):
+            if link._requires_target and tgt is None:
                 continue
+            cb = cls._callbacks[type(link)]
             overrides = arg_overrides.get(id(link), {})
             callbacks.append(cb(root_model, link, src, tgt,
-                                arg_overrides=overrides))
+                                arg_overrides=overrides, hv_loaded=hv_loaded,
+                                handles_cache=handles_cache))
         return callbacks
 
+    @classmethod
+    def _process_hv_links(cls, root_view, root_model, linked):
+        """
+        Returns the links targeting HoloViews elements rendered in the
+        root along with the args overrides resolving HoloViews
+        elements to their plots.
+        """
+        hv_views = root_view.select(HoloViews)
+        map_hve_bk = generate_panel_bokeh_map(root_model, hv_views)
+        found, arg_overrides = [], {}
+        for src, links in linked:
+            for link in links:
+                if hasattr(link, 'target'):
+                    for tgt in map_hve_bk.get(link.target, []):
+                        found.append((link, src, tgt))
+                arg_overrides[id(link)] = {}
+                for k, v in link.args.items():
+                    for tgt in map_hve_bk.get(v, []):
+                        arg_overrides[id(link)][k] = tgt
+        return found, arg_overrides
+
 
 class Link(Callback):
     """
@@ -144,7 +279,7 @@ class Link(Callback):
     def __init__(self, source, target=None, **params):
         if self._requires_target and target is None:
             raise ValueError('%s must define a target.' % type(self).__name__)
-        # Source is stored as a weakref to allow it to be garbage collected
+        # Target is stored as a weakref to allow it to be garbage collected
         self._target = None if target is None else weakref.ref(target)
         super(Link, self).__init__(source, **params)
 
@@ -157,45 +292,52 @@ class Link(Callback):
         Registers the Link
         """
         self.init()
-        if self.source in self.registry:
-            links = self.registry[self.source]
-            params = {
-                k: v for k, v in self.get_param_values() if k != 'name'}
-            for link in links:
-                link_params = {
-                    k: v for k, v in link.get_param_values() if k != 'name'}
-                if (type(link) is type(self) and link.source is self.source
-                    and link.target is self.target and params == link_params):
-                    return
-            self.registry[self.source].append(self)
-        else:
-            self.registry[self.source] = [self]
+        links = self.registry.get(self.source)
+        if links is None:
+            links = self.registry[self.source] = _LinkIndex()
+        elif links.find(self) is not None:
+            return
+        links.add(self)
 
     def unlink(self):
         """
         Unregisters the Link
         """
         links = self.registry.get(self.source)
-        if self in links:
-            links.pop(links.index(self))
+        if links is not None and self in links:
+            links.remove(self)
 
 
 
 class CallbackGenerator(object):
 
-    def __init__(self, root_model, link, source, target=None, arg_overrides={}):
+    # Generators are created per link and root, avoid per instance dicts
+    __slots__ = ('root_model', 'link', 'source', 'target', 'arg_overrides',
+                 '_hv_loaded', '_handles_cache', '_references')
+
+    def __init__(self, root_model, link, source, target=None, arg_overrides={},
+                 hv_loaded=None, handles_cache=None):
         self.root_model = root_model
         self.link = link
         self.source = source
         self.target = target
         self.arg_overrides = arg_overrides
+        if hv_loaded is None:
+            hv_loaded = 'holoviews' in sys.modules
+        self._hv_loaded = hv_loaded
+        # Bokeh model handles of HoloViews plots, which may be shared
+        # between generators created while processing the same root
+        self._handles_cache = {} if handles_cache is None else handles_cache
+        # References shared by all specs, resolved once a callback
+        # actually has to be registered
+        self._references = None
         self.validate()
         specs = self._get_specs(link, source, target)
         for src_spec, tgt_spec, code in specs:
             self._init_callback(root_model, link, source, src_spec, target, tgt_spec, code)
 
     @classmethod
-    def _resolve_model(cls, root_model, obj, model_spec):
+    def _resolve_model(cls, root_model, obj, model_spec, hv_loaded=None):
         """
         Resolves a model given the supplied object and a model_spec.
 
@@ -209,6 +351,9 @@ class CallbackGenerator(object):
           A string defining how to look up the model, can be a single
           string defining the handle in a HoloViews plot or a path
           split by periods (.) to indicate a multi-level lookup.
+        hv_loaded: boolean (optional)
+          Whether HoloViews has been imported, looked up in sys.modules
+          if not supplied.
 
         Returns
         -------
@@ -216,52 +361,56 @@ class CallbackGenerator(object):
           The resolved bokeh model
         """
         model = None
-        if 'holoviews' in sys.modules and is_bokeh_element_plot(obj):
+        if hv_loaded is None:
+            hv_loaded = 'holoviews' in sys.modules
+        if hv_loaded and is_bokeh_element_plot(obj):
             if model_spec is None:
                 return obj.state
             else:
-                model_specs = model_spec.split('.')
-                handle_spec = model_specs[0]
-                if len(model_specs) > 1:
-                    model_spec = '.'.join(model_specs[1:])
-                else:
-                    model_spec = None
+                handle_spec, _, model_spec = model_spec.partition('.')
+                model_spec = model_spec or None
                 model = obj.handles[handle_spec]
         elif isinstance(obj, Viewable):
             model, _ = obj._models[root_model.ref['id']]
         elif isinstance(obj, BkModel):
             model = obj
         if model_spec is not None:
-            for spec in model_spec.split('.'):
-                model = getattr(model, spec)
+            model = _spec_getter(model_spec)(model)
         return model
 
-    def _init_callback(self, root_model, link, source, src_spec, target, tgt_spec, code):
-        references = {k: v for k, v in link.get_param_values()
+    def _get_handles(self, plot, prefix):
+        """
+        Returns the bokeh models in the handles of a HoloViews plot
+        with the supplied prefix applied to the handle names.
+        """
+        key = (id(plot), prefix)
+        handles = self._handles_cache.get(key)
+        if handles is None:
+            handles = {prefix+k: v for k, v in plot.handles.items()
+                       if isinstance(v, BkModel)}
+            self._handles_cache[key] = handles
+        return handles
+
+    def _get_references(self, root_model, link, source, target):
+        """
+        Returns the references which are shared by the callbacks
+        generated for each spec of the link, i.e. the link parameters,
+        the resolved args and the bokeh models of HoloViews plots.
+        """
+        param_refs = {k: v for k, v in link.get_param_values()
                       if k not in ('source', 'target', 'name', 'code', 'args')}
 
-        src_model = self._resolve_model(root_model, source, src_spec[0])
-        ref = root_model.ref['id']
-        link_id = id(link)
-        if any(link_id in cb.tags for cbs in src_model.js_property_callbacks.values() for cb in cbs):
-            # Skip registering callback if already registered
-            return
-        references['source'] = references['cb_obj'] = src_model
-
-        tgt_model = None
-        if link._requires_target:
-            tgt_model = self._resolve_model(root_model, target, tgt_spec[0])
-            if tgt_model is not None:
-                references['target'] = tgt_model
-
+        arg_refs = {}
         for k, v in dict(link.args, **self.arg_overrides).items():
-            arg_model = self._resolve_model(root_model, v, None)
+            arg_model = self._resolve_model(root_model, v, None, self._hv_loaded)
             if arg_model is not None:
-                references[k] = arg_model
+                arg_refs[k] = arg_model
             elif not isinstance(v, param.Parameterized):
-                references[k] = v
+                arg_refs[k] = v
 
-        if 'holoviews' in sys.modules:
+        handle_refs = {}
+        if self._hv_loaded:
+            ref = root_model.ref['id']
             if isinstance(source, HoloViews):
                 src = source._plots[ref][0]
             else:
@@ -269,10 +418,7 @@ class CallbackGenerator(object):
 
             prefix = 'source_' if hasattr(link, 'target') else ''
             if is_bokeh_element_plot(src):
-                for k, v in src.handles.items():
-                    k = prefix + k
-                    if isinstance(v, BkModel) and k not in references:
-                        references[k] = v
+                handle_refs.update(self._get_handles(src, prefix))
 
             if isinstance(target, HoloViews):
                 tgt = target._plots[ref][0]
@@ -280,10 +426,35 @@ class CallbackGenerator(object):
                 tgt = target
 
             if is_bokeh_element_plot(tgt):
-                for k, v in tgt.handles.items():
-                    k = 'target_' + k
-                    if isinstance(v, BkModel) and k not in references:
-                        references[k] = v
+                for k, v in self._get_handles(tgt, 'target_').items():
+                    handle_refs.setdefault(k, v)
+        return param_refs, arg_refs, handle_refs
+
+    def _init_callback(self, root_model, link, source, src_spec, target, tgt_spec, code):
+        src_model = self._resolve_model(root_model, source, src_spec[0], self._hv_loaded)
+        link_id = id(link)
+        # Ids of the links with callbacks registered on the model
+        registered = getattr(src_model, '_panel_link_ids', None)
+        if registered is None:
+            registered = src_model._panel_link_ids = set()
+        elif link_id in registered:
+            # Skip registering callback if already registered
+            return
+        if self._references is None:
+            self._references = self._get_references(root_model, link, source, target)
+        param_refs, arg_refs, handle_refs = self._references
+        references = dict(param_refs)
+        references['source'] = references['cb_obj'] = src_model
+
+        tgt_model = None
+        if link._requires_target:
+            tgt_model = self._resolve_model(root_model, target, tgt_spec[0], self._hv_loaded)
+            if tgt_model is not None:
+                references['target'] = tgt_model
+
+        references.update(arg_refs)
+        for k, v in handle_refs.items():
+            references.setdefault(k, v)
 
         self._initialize_models(link, source, src_model, src_spec[1], target, tgt_model, tgt_spec[1])
         self._process_references(references)
@@ -295,6 +466,8 @@ class CallbackGenerator(object):
         changes, events = self._get_triggers(link, src_spec)
         for ch in changes:
             src_model.js_on_change(ch, src_cb)
+        if changes:
+            registered.add(link_id)
         for ev in events:
             src_model.js_on_event(ev, src_cb)
 
@@ -336,18 +509,20 @@ class CallbackGenerator(object):
 
 class JSCallbackGenerator(CallbackGenerator):
 
+    __slots__ = ()
+
     def _get_triggers(self, link, src_spec):
         return [src_spec[1]], []
 
     def _get_specs(self, link, source, target):
+        src_rename = source._rename if isinstance(source, Reactive) else None
         for src_spec, code in link.code.items():
-            src_specs = src_spec.split('.')
-            if len(src_specs) > 1:
-                src_spec = ('.'.join(src_specs[:-1]), src_specs[-1])
+            src_model, sep, src_prop = src_spec.rpartition('.')
+            if sep:
+                src_spec = (src_model, src_prop)
             else:
-                src_prop = src_specs[0]
-                if isinstance(source, Reactive):
-                    src_prop = source._rename.get(src_prop, src_prop)
+                if src_rename:
+                    src_prop = src_rename.get(src_prop, src_prop)
                 src_spec = (None, src_prop)
         return [(src_spec, (None, None), code)]
 
@@ -355,34 +530,39 @@ class JSCallbackGenerator(CallbackGenerator):
 
 class JSLinkCallbackGenerator(JSCallbackGenerator):
 
+    __slots__ = ()
+
     def _get_specs(self, link, source, target):
         if link.code:
             return super(JSLinkCallbackGenerator, self)._get_specs(link, source, target)
 
         specs = []
+        src_rename = source._rename if isinstance(source, Reactive) else None
+        tgt_rename = target._rename if isinstance(target, Reactive) else None
         for src_spec, tgt_spec in link.properties.items():
-            src_specs = src_spec.split('.')
-            if len(src_specs) > 1:
-                src_spec = ('.'.join(src_specs[:-1]), src_specs[-1])
+            src_model, sep, src_prop = src_spec.rpartition('.')
+            if sep:
+                src_spec = (src_model, src_prop)
             else:
-                src_prop = src_specs[0]
-                if isinstance(source, Reactive):
-                    src_prop = source._rename.get(src_prop, src_prop)
+                if src_rename:
+                    src_prop = src_rename.get(src_prop, src_prop)
                 src_spec = (None, src_prop)
-            tgt_specs = tgt_spec.split('.')
-            if len(tgt_specs) > 1:
-                tgt_spec = ('.'.join(tgt_specs[:-1]), tgt_specs[-1])
+            tgt_model, sep, tgt_prop = tgt_spec.rpartition('.')
+            if sep:
+                tgt_spec = (tgt_model, tgt_prop)
             else:
-                tgt_prop = tgt_specs[0]
-                if isinstance(target, Reactive):
-                    tgt_prop = target._rename.get(tgt_prop, tgt_prop)
+                if tgt_rename:
+                    tgt_prop = tgt_rename.get(tgt_prop, tgt_prop)
                 tgt_spec = (None, tgt_prop)
             specs.append((src_spec, tgt_spec, None))
         return specs
 
     def _initialize_models(self, link, source, src_model, src_spec, target, tgt_model, tgt_spec):
         if tgt_model and src_spec and tgt_spec:
-            setattr(tgt_model, tgt_spec, getattr(src_model, src_spec))
+            value = getattr(src_model, src_spec)
+            # Avoid validating and triggering events if value is unchanged
+            if getattr(tgt_model, tgt_spec, _missing) is not value:
+                setattr(tgt_model, tgt_spec, value)
         if tgt_model is None and not link.code:
             raise ValueError('Model could not be resolved on target '
                              '%s and no custom code was specified.' %
@@ -398,13 +578,7 @@ class JSLinkCallbackGenerator(JSCallbackGenerator):
             references[k[7:]] = references.pop(k)
 
     def _get_code(self, link, source, src_spec, target, tgt_spec):
-        return ("value = source[{src_repr}];"
-                "try {{ property = target.properties[{tgt_repr}];"
-                "if (property !== undefined) {{ property.validate(value); }} }}"
-                "catch(err) {{ console.log('WARNING: Could not set {tgt} on target, raised error: ' + err); return; }}"
-                "target[{tgt_repr}] = value".format(
-                    tgt=tgt_spec, tgt_repr=unicode_repr(tgt_spec),
-                    src=src_spec, src_repr=unicode_repr(src_spec)))
+        return _link_code(src_spec, tgt_spec)
 
 
 Callback.register_callback(callback=JSCallbackGenerator)
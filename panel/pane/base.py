@@ -11,6 +11,7 @@ import param
 from bokeh.io import curdoc as _curdoc
 
 from ..io import push, state
+from ..io.state import ViewEntry
 from ..layout import Panel, Row
 from ..viewable import Viewable, Reactive, Layoutable
 from ..util import param_reprs
@@ -118,8 +119,9 @@ class PaneBase(Reactive):
 
         from ..io import state
         ref = root.ref['id']
-        if ref in state._views:
-            state._views[ref][0]._preprocess(root)
+        view = state._views.get(ref)
+        if view is not None:
+            view.viewable._preprocess(root)
 
     def _update_pane(self, event):
         for ref, (model, parent) in self._models.items():
@@ -194,7 +196,7 @@ class PaneBase(Reactive):
             root = self.layout._get_model(doc, comm=comm)
         self._preprocess(root)
         ref = root.ref['id']
-        state._views[ref] = (self, root, doc, comm)
+        state._views[ref] = ViewEntry(self, root, doc, comm)
         return root
 
     @classmethod
@@ -19,7 +19,7 @@ import param
 from bokeh.io import curdoc as _curdoc
 from param.parameterized import classlist
 
-from .io import state
+from .io.state import ViewEntry, state
 from .layout import Row, Panel, Tabs, Column
 from .links import Link
 from .pane.base import Pane, PaneBase
@@ -503,7 +503,7 @@ class Param(PaneBase):
         root = self.layout.get_root(doc, comm)
         ref = root.ref['id']
         self._models[ref] = (root, None)
-        state._views[ref] = (self, root, doc, comm)
+        state._views[ref] = ViewEntry(self, root, doc, comm)
         return root
 
 
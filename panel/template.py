@@ -21,6 +21,7 @@ from .io.server import StoppableThread, get_server
 from .io.state import state
 from .layout import Column
 from .pane import panel as _panel, PaneBase, HTML, Str
+from .util import memoize
 from .widgets import Button
 
 _server_info = (
@@ -28,6 +29,16 @@ _server_info = (
     'https://localhost:{port}</a>')
 
 
+@memoize(64)
+def _compile_template(source):
+    """
+    Compiles a template string, reusing the compiled Template when the
+    same source is supplied again, e.g. when an app creates its
+    Template on every session.
+    """
+    return _Template(source)
+
+
 class Template(object):
     """
     A Template is a high-level component to render multiple Panel
@@ -58,18 +69,28 @@ class Template(object):
 
     def __init__(self, template=None, items=None, nb_template=None):
         if isinstance(template, string_types):
-            template = _Template(template)
+            template = _compile_template(template)
         self.template = template
         if isinstance(nb_template, string_types):
-            nb_template = _Template(nb_template)
+            nb_template = _compile_template(nb_template)
         self.nb_template = nb_template or template
         self._render_items = {}
         self._server = None
-        self._layout = self._build_layout()
+        self._repr_stale = False
+        self._layout_panel = self._build_layout()
         items = {} if items is None else items
         for name, item in items.items():
             self.add_panel(name, item)
 
+    @property
+    def _layout(self):
+        # The repr is only updated when the layout is accessed to avoid
+        # rebuilding it every time a panel is added
+        if self._repr_stale:
+            self._layout_panel[0].object = repr(self)
+            self._repr_stale = False
+        return self._layout_panel
+
     def _build_layout(self):
         str_repr = Str(repr(self))
         server_info = HTML('')
@@ -97,7 +118,7 @@ class Template(object):
         Callback to handle FunctionHandler document creation.
         """
         if server_id:
-            state._servers[server_id][2].append(doc)
+            state._servers[server_id].docs.append(doc)
         return self.server_doc(doc)
 
     def __repr__(self):
@@ -181,7 +202,7 @@ class Template(object):
                              'has a unique name by which it can be '
                              'referenced in the template.' % name)
         self._render_items[name] = _panel(panel)
-        self._layout[0].object = repr(self)
+        self._repr_stale = True
 
     def server_doc(self, doc=None, title=None):
         """
@@ -1,12 +1,20 @@
 import os
 import json
 import glob
+import struct
+import threading
 
 from io import StringIO
 
+import numpy as np
+
+from bokeh.models import ColumnDataSource, Div
+
 from panel import Row
 from panel.config import config
 from panel.io.embed import embed_state
+from panel.io.notebook import _compiled_templates, load_notebook, push
+from panel.io.state import state as _state
 from panel.pane import Str
 from panel.widgets import Select, FloatSlider, Checkbox
 
@@ -127,3 +135,115 @@ def test_save_embed_json(tmpdir):
         assert event['kind'] == 'ModelChanged'
         assert event['attr'] == 'text'
         assert event['new'] == '<pre>%s</pre>' % v
+
+
+class _RecordingComm(object):
+
+    def __init__(self):
+        self.messages = []
+
+    def send(self, data=None, metadata=None, buffers=[]):
+        self.messages.append((data, buffers))
+
+
+def test_compiled_templates_stale(tmpdir):
+    from jinja2 import __version__ as jinja_version
+    source = tmpdir.join('template.html')
+    source.write('')
+    compiled = tmpdir.mkdir('compiled')
+    assert _compiled_templates(str(tmpdir)) is None
+
+    version = compiled.join('jinja_version')
+    version.write(jinja_version)
+    source.setmtime(version.mtime()-10)
+    assert _compiled_templates(str(tmpdir)) == str(compiled)
+
+    source.setmtime(version.mtime()+10)
+    assert _compiled_templates(str(tmpdir)) is None
+
+    version.write('0.0')
+    source.setmtime(version.mtime()-10)
+    assert _compiled_templates(str(tmpdir)) is None
+
+
+def test_load_notebook_config_resources(monkeypatch):
+    import IPython.display
+    published = []
+    monkeypatch.setattr(IPython.display, 'publish_display_data',
+                        lambda *args, **kwargs: published.append((args, kwargs)))
+
+    load_notebook(True)
+    assert '.custom-css' not in published[0][0][0]['application/javascript']
+
+    with config.set(raw_css=['.custom-css {color: red;}'],
+                    js_files={'custom': 'https://custom.js'}):
+        load_notebook(True)
+    js = published[2][0][0]['application/javascript']
+    assert '.custom-css' in js
+    assert 'https://custom.js' in js
+
+
+def test_push_binary_frame(document):
+    div = Div()
+    document.add_root(div)
+    document.hold()
+    div.text = 'Test'
+    comm = _RecordingComm()
+    push(document, comm)
+    assert len(comm.messages) == 1
+    data, buffers = comm.messages[0]
+    assert data == {'framed': True}
+    nheader, nmetadata, ncontent, nbuffers = struct.unpack('<IIII', buffers[0][:16])
+    assert nbuffers == 0
+    frame = buffers[0][16:]
+    header = json.loads(frame[:nheader].decode('utf-8'))
+    assert header['msgtype'] == 'PATCH-DOC'
+    start = nheader+nmetadata
+    content = json.loads(frame[start:start+ncontent].decode('utf-8'))
+    event = content['events'][0]
+    assert event['attr'] == 'text'
+    assert event['new'] == 'Test'
+
+
+def test_push_binary_frame_buffers(document):
+    source = ColumnDataSource(data={'x': np.arange(10)})
+    document.add_root(source)
+    document.hold()
+    source.data = {'x': np.arange(20.)}
+    comm = _RecordingComm()
+    push(document, comm)
+    assert len(comm.messages) == 1
+    _, buffers = comm.messages[0]
+    nheader, nmetadata, ncontent, nbuffers = struct.unpack('<IIII', buffers[0][:16])
+    assert nbuffers == 1
+    assert len(buffers) == 2
+    offset = 16+nheader+nmetadata+ncontent
+    nbuffer_header, = struct.unpack('<I', buffers[0][offset:offset+4])
+    buffer_header = json.loads(buffers[0][offset+4:offset+4+nbuffer_header].decode('utf-8'))
+    assert 'id' in buffer_header
+    assert np.frombuffer(buffers[1], dtype='float64').tolist() == list(range(20))
+
+
+def test_push_text(document):
+    div = Div()
+    document.add_root(div)
+    document.hold()
+    div.text = 'Test'
+    comm = _RecordingComm()
+    push(document, comm, binary=False)
+    assert len(comm.messages) == 3
+    assert all(not buffers for _, buffers in comm.messages)
+
+
+def test_state_unblocked_per_thread(document):
+    results = []
+    _state.curdoc = document
+    try:
+        thread = threading.Thread(target=lambda: results.append(_state._unblocked(document)))
+        thread.start()
+        thread.join()
+        assert _state._unblocked(document)
+    finally:
+        _state.curdoc = None
+    assert results == [False]
+    assert not _state._unblocked(document)
@@ -94,6 +94,42 @@ def test_bkwidget_bkplot_links(document, comm):
     assert link_customjs.code == code
 
 
+def test_link_registry_deduplicates_links():
+    from bokeh.models import Slider
+    bokeh_widget = Slider(value=5, start=1, end=10, step=1e-1)
+    bokeh_fig = figure()
+    scatter = bokeh_fig.scatter([1, 2, 3], [1, 2, 3])
+
+    link1 = Link(bokeh_widget, scatter, properties={'value': 'glyph.size'})
+    Link(bokeh_widget, scatter, properties={'value': 'glyph.size'})
+    link3 = Link(bokeh_widget, scatter, properties={'value': 'glyph.line_width'})
+
+    links = Link.registry[bokeh_widget]
+    assert list(links) == [link1, link3]
+
+    link1.unlink()
+    assert list(links) == [link3]
+    assert link1 not in links
+
+
+def test_link_unlink_collected_target():
+    import gc
+    from bokeh.models import Slider
+    bokeh_widget = Slider(value=5, start=1, end=10, step=1e-1)
+    target = Slider(value=5, start=1, end=10, step=1e-1)
+
+    link = Link(bokeh_widget, target, properties={'value': 'value'})
+    del target
+    gc.collect()
+    assert link.target is None
+
+    links = Link.registry[bokeh_widget]
+    assert link in links
+    link.unlink()
+    assert link not in links
+    assert list(links) == []
+
+
 def test_widget_bkplot_link(document, comm):
     widget = ColorPicker(value='#ff00ff')
     bokeh_fig = figure()
@@ -116,6 +152,19 @@ def test_widget_bkplot_link(document, comm):
     assert link_customjs.code == code
 
 
+def test_widget_link_target_outside_root(document, comm):
+    widget = ColorPicker(value='#ff00ff')
+    other = ColorPicker(value='#00ff00')
+
+    link = widget.jslink(other, value='value')
+
+    row = Row(widget)
+    model = row.get_root(document, comm=comm)
+
+    callbacks = model.children[0].js_property_callbacks.get('change:color', [])
+    assert not any(id(link) in cb.tags for cb in callbacks)
+
+
 def test_widget_jscallback(document, comm):
     widget = ColorPicker(value='#ff00ff')
 
@@ -153,6 +202,22 @@ def test_widget_jscallback_args_model(document, comm):
     assert customjs.code == "some_code"
 
 
+def test_widget_jscallback_args_removed_from_root(document, comm):
+    widget = ColorPicker(value='#ff00ff')
+    widget2 = ColorPicker(value='#ff00ff')
+
+    widget.jscallback(value='some_code', args={'widget': widget2})
+
+    row = Row(widget, widget2)
+    model = row.get_root(document, comm=comm)
+
+    row.pop(1)
+    row.append(ColorPicker())
+
+    customjs = model.children[0].js_property_callbacks['change:color'][-1]
+    assert customjs.args['source'] is model.children[0]
+
+
 @hv_available
 def test_hvplot_jscallback(document, comm):
     points1 = hv.Points([1, 2, 3])
@@ -194,3 +259,13 @@ def test_link_with_customcode(document, comm):
     assert link_customjs.args['source'] is range_slider
     assert link_customjs.args['x_range'] is x_range
     assert link_customjs.code == code
+
+
+def test_links_share_source_and_target_weakrefs():
+    s1 = FloatSlider()
+    s2 = FloatSlider()
+    link1 = s1.jslink(s2, value='value')
+    link2 = s1.jslink(s2, value='start')
+
+    assert link1._source is link2._source
+    assert link1._target is link2._target
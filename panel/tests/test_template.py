@@ -0,0 +1,28 @@
+from __future__ import absolute_import, division, unicode_literals
+
+from panel.pane import Markdown
+from panel.template import Template
+from panel.widgets import FloatSlider
+
+template = """
+{% extends base %}
+
+{% block contents %}
+{% for root in roots %}
+<div>{{ embed(root) }}</div>
+{% endfor %}
+{% endblock %}
+"""
+
+
+def test_template_layout_repr_updated_lazily():
+    tmpl = Template(template)
+
+    tmpl.add_panel('A', Markdown('# Title'))
+    tmpl.add_panel('B', FloatSlider())
+    tmpl.add_panel('C', Markdown('Text'))
+
+    assert tmpl._repr_stale
+    assert tmpl._layout[0].object == repr(tmpl)
+    assert not tmpl._repr_stale
+    assert '[C]' in tmpl._layout[0].object
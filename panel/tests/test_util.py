@@ -4,7 +4,7 @@ from bokeh.models import Div
 
 from panel.io.notebook import render_mimebundle
 from panel.pane import PaneBase
-from panel.util import get_method_owner, abbreviated_repr
+from panel.util import get_method_owner, abbreviated_repr, memoize
 
 
 def test_get_method_owner_class():
@@ -37,3 +37,19 @@ def test_abbreviated_repr_list():
 def test_abbreviated_repr_ordereddict():
     assert (abbreviated_repr(OrderedDict([('key', 'some really, really long string')]))
             == "OrderedDict([('key', ...])")
+
+
+def test_memoize():
+    calls = []
+
+    @memoize(2)
+    def add(a, b):
+        calls.append((a, b))
+        return a + b
+
+    assert add(1, 2) == 3
+    assert add(1, 2) == 3
+    assert calls == [(1, 2)]
+    add(2, 3)
+    add(3, 4)
+    assert len(add.cache) == 1
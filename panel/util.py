@@ -150,6 +150,30 @@ def full_groupby(l, key=lambda x: x):
     return d.items()
 
 
+def memoize(maxsize=128):
+    """
+    Decorator which caches the return value of a function of hashable
+    positional arguments, clearing the cache once it holds maxsize
+    entries. Unlike functools.lru_cache it is available on Python 2.
+    """
+    def decorator(fn):
+        cache = {}
+        def wrapper(*args):
+            try:
+                return cache[args]
+            except KeyError:
+                pass
+            if len(cache) >= maxsize:
+                cache.clear()
+            value = cache[args] = fn(*args)
+            return value
+        wrapper.cache = cache
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        return wrapper
+    return decorator
+
+
 def get_method_owner(meth):
     """
     Returns the instance owning the supplied instancemethod or
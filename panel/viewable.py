@@ -8,7 +8,6 @@ from __future__ import absolute_import, division, unicode_literals
 import logging
 import re
 import sys
-import threading
 
 from functools import partial
 
@@ -27,7 +26,7 @@ from .io.model import add_to_doc
 from .io.notebook import (get_comm_customjs, push, render_mimebundle,
                           render_model, show_embed, show_server)
 from .io.save import save
-from .io.state import state
+from .io.state import ViewEntry, state
 from .io.server import StoppableThread, get_server
 from .util import param_reprs
 
@@ -323,7 +322,7 @@ class Viewable(Layoutable):
         Callback to handle FunctionHandler document creation.
         """
         if server_id:
-            state._servers[server_id][2].append(doc)
+            state._servers[server_id].docs.append(doc)
         return self.server_doc(doc)
 
     def _get_server(self, port=0, websocket_origin=None, loop=None,
@@ -432,7 +431,7 @@ class Viewable(Layoutable):
         root = self._get_model(doc, comm=comm)
         self._preprocess(root)
         ref = root.ref['id']
-        state._views[ref] = (self, root, doc, comm)
+        state._views[ref] = ViewEntry(self, root, doc, comm)
         return root
 
     def save(self, filename, title=None, resources=None, template=None,
@@ -640,9 +639,10 @@ class Reactive(Viewable):
                 return
 
             for ref, (model, parent) in self._models.items():
-                if ref not in state._views:
+                view = state._views.get(ref)
+                if view is None:
                     continue
-                viewable, root, doc, comm = state._views[ref]
+                viewable, root, doc, comm = view
 
                 if comm or state._unblocked(doc):
                     self._update_model(events, msg, root, model, doc, comm)
@@ -667,12 +667,13 @@ class Reactive(Viewable):
             pass
         else:
             client_comm = state._comm_manager.get_client_comm(on_msg=self._comm_change)
+            plot_id = root.id
             for p in properties:
                 if isinstance(p, tuple):
                     p, attr = p
                 else:
                     p, attr = p, p
-                customjs = self._get_customjs(attr, client_comm, root.ref['id'])
+                customjs = self._get_customjs(attr, client_comm, plot_id)
                 model.js_on_change(p, customjs)
 
     def _comm_change(self, msg):
@@ -701,16 +702,12 @@ class Reactive(Viewable):
     def _change_event(self, doc=None):
         try:
             state.curdoc = doc
-            thread = threading.current_thread()
-            thread_id = thread.ident if thread else None
-            state._thread_id = thread_id
             events = self._events
             self._events = {}
             self._process_events(events)
         finally:
             self._processing = False
             state.curdoc = None
-            state._thread_id = None
 
     def _get_customjs(self, change, client_comm, plot_id):
         """
@@ -37,6 +37,29 @@ def _build_paneljs():
     build(panel_dir)
 
 
+def _compile_templates():
+    import shutil
+    import jinja2
+    from jinja2 import Environment, FileSystemLoader
+    print("Compiling templates:")
+    template_dir = os.path.join(os.path.dirname(__file__), "panel", "_templates")
+    compiled_dir = os.path.join(template_dir, "compiled")
+    # Remove previously compiled templates, which would otherwise be
+    # compiled as templates themselves
+    if os.path.isdir(compiled_dir):
+        shutil.rmtree(compiled_dir)
+    env = Environment(loader=FileSystemLoader(template_dir))
+    # Filters must be declared for the templates to compile, the
+    # implementation is looked up on the runtime environment
+    env.filters['json'] = json.dumps
+    env.compile_templates(compiled_dir, zip=None, ignore_errors=False,
+                          filter_func=lambda name: not name.startswith('compiled/'))
+    # Record the Jinja version the templates were compiled with, the
+    # compiled templates are ignored when loaded with another version
+    with open(os.path.join(compiled_dir, "jinja_version"), "w") as f:
+        f.write(jinja2.__version__)
+
+
 class CustomDevelopCommand(develop):
     """Custom installation for development mode."""
 
@@ -50,6 +73,7 @@ class CustomInstallCommand(install):
 
     def run(self):
         _build_paneljs()
+        _compile_templates()
         install.run(self)
 
 
@@ -58,6 +82,7 @@ class CustomSdistCommand(sdist):
 
     def run(self):
         _build_paneljs()
+        _compile_templates()
         sdist.run(self)
 
 
@@ -77,6 +102,7 @@ try:
         def run(self):
             """Do nothing so the command intentionally fails."""
             _build_paneljs()
+            _compile_templates()
             bdist_wheel.run(self)
 
     _COMMANDS['bdist_wheel'] = CustomBdistWheelCommand